@@ -1,119 +1,404 @@
-from models.orm_model import Channel, Comment, Video
+from models.orm_model import (
+    Channel, Comment, Video, VideoDailyStats, ChannelDailyStats, CommenterStats,
+    VideoStatsSnapshot, ChannelStatsSnapshot
+)
 from models.database import connection
+from models.known_ids import KnownIdSet
 
-from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
+from sqlalchemy import BigInteger, Date, String, and_, any_, bindparam, cast, delete, func, insert, select, update
 
+from collections import defaultdict
 from datetime import datetime
 
-@connection 
-async def insert_data_api(
-    # comment_data
-    comment_data: list[dict],
-    
-    # video_data
-    video_id: str,
-    title: str,
-    view_count: int,
-    comment_count: int,
-    like_count: int,
-    publish_date: datetime,
-    channel_id: str,
-    
-    # channel_data
-    id_channel: str, 
-    title_channel: str, 
-    view_count_channel: int, 
-    subscription_count: int, 
-    video_count: int, 
-    account_creation_date: datetime, 
-    
-    session: AsyncSession,
-    
-    # video_data (optional)
-    description: str | None = None,
-    category: str | None = None,
-   
-    # channel_data (optional)
-    country: str | None = None, 
-    keywords: str | None = None, 
-    description_channel: str | None = None
-) -> str:
+class CommentStats:
+    """Accumulates aggregate deltas for newly inserted comments"""
+    def __init__(self):
+        # key -> [comment_count, reply_count, like_count]
+        self.video_days = defaultdict(lambda: [0, 0, 0])
+        self.channel_days = defaultdict(lambda: [0, 0, 0])
+        # key -> [comment_count, like_count, last_comment_date]
+        self.commenters = defaultdict(lambda: [0, 0, None])
 
-    try:
-        # Create channel
-        existing_channel = await session.scalar(
-            select(Channel).where(Channel.id_channel == id_channel)
-        )
-        
-        if not existing_channel:
-            channel = Channel(
-                id_channel=id_channel,
-                title_channel=title_channel,
-                keywords=keywords,
-                description_channel=description_channel,
-                view_count_channel=view_count_channel,
-                subscription_count=subscription_count,
-                video_count=video_count,
-                country=country,
-                account_creation_date=account_creation_date
+    def add(self, rows, video_id: str, channel_id: str | None) -> None:
+        """Adds rows (publish_date, like_count, parent_comment_id, commenter_channel_id) of one video"""
+        for publish_date, like_count, parent_comment_id, commenter_channel_id in rows:
+            like_count = like_count or 0
+            is_reply = 1 if parent_comment_id else 0
+            if publish_date is not None:
+                day = publish_date.date()
+                targets = [self.video_days[(video_id, day)]]
+                if channel_id:
+                    targets.append(self.channel_days[(channel_id, day)])
+                for counters in targets:
+                    counters[0] += 1
+                    counters[1] += is_reply
+                    counters[2] += like_count
+            if channel_id and commenter_channel_id:
+                counters = self.commenters[(channel_id, commenter_channel_id)]
+                counters[0] += 1
+                counters[1] += like_count
+                if publish_date is not None and (counters[2] is None or publish_date > counters[2]):
+                    counters[2] = publish_date
+
+    async def flush(self, session: AsyncSession, batch_size: int = 1000) -> None:
+        """
+        Upserts the accumulated deltas, adding them to the stored counters.
+        Rows are sent in chunks to stay under the bind parameter limit of one statement,
+        sorted by the conflict key so concurrent writers lock rows in the same order.
+        """
+        for model, key_name, buckets in (
+            (VideoDailyStats, 'video_id', self.video_days),
+            (ChannelDailyStats, 'channel_id', self.channel_days)
+        ):
+            values = [
+                {key_name: key, 'day': day, 'comment_count': c, 'reply_count': r, 'like_count': l}
+                for (key, day), (c, r, l) in sorted(buckets.items())
+            ]
+            for i in range(0, len(values), batch_size):
+                stmt = pg_insert(model).values(values[i:i + batch_size])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[key_name, 'day'],
+                    set_={
+                        'comment_count': model.comment_count + stmt.excluded.comment_count,
+                        'reply_count': model.reply_count + stmt.excluded.reply_count,
+                        'like_count': model.like_count + stmt.excluded.like_count,
+                        'updated_at': func.now()
+                    }
+                )
+                await session.execute(stmt)
+
+        values = [
+            {
+                'channel_id': channel_id,
+                'commenter_channel_id': commenter_channel_id,
+                'comment_count': c,
+                'like_count': l,
+                'last_comment_date': last
+            }
+            for (channel_id, commenter_channel_id), (c, l, last) in sorted(self.commenters.items())
+        ]
+        for i in range(0, len(values), batch_size):
+            stmt = pg_insert(CommenterStats).values(values[i:i + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['channel_id', 'commenter_channel_id'],
+                set_={
+                    'comment_count': CommenterStats.comment_count + stmt.excluded.comment_count,
+                    'like_count': CommenterStats.like_count + stmt.excluded.like_count,
+                    'last_comment_date': func.greatest(
+                        CommenterStats.last_comment_date, stmt.excluded.last_comment_date
+                    ),
+                    'updated_at': func.now()
+                }
             )
-            session.add(channel)
-            await session.flush()
-        else:
-            channel = existing_channel
-
-        # Create video
-        existing_video = await session.scalar(
-            select(Video).where(Video.video_id == video_id)
+            await session.execute(stmt)
+
+def _comment_values(com: dict, video_id: str, channel_id: str) -> dict:
+    """Maps a converted API comment to the columns of the comments table"""
+    return {
+        'comment_id': com['comment_id'],
+        'text': com['text'],
+        'comment_publish_date': com['comment_publish_date'],
+        'like_count': com['comment_like_count'],
+        'reply_count': com.get('reply_count', 0),
+        'video_id': video_id,
+        'commenter_channel_id': com.get('commenter_channel_id', channel_id),
+        'parent_comment_id': com.get('comment_parent_id')
+    }
+
+async def _append_snapshots(session: AsyncSession, videos: list[dict], channels: list[dict]) -> None:
+    """Appends statistics snapshots (append-only time series keyed by entity and capture time)"""
+    captured_at = datetime.now()
+    if videos:
+        await session.execute(
+            pg_insert(VideoStatsSnapshot)
+            .values([{**row, 'captured_at': captured_at} for row in videos])
+            .on_conflict_do_nothing()
+        )
+    if channels:
+        await session.execute(
+            pg_insert(ChannelStatsSnapshot)
+            .values([{**row, 'captured_at': captured_at} for row in channels])
+            .on_conflict_do_nothing()
         )
 
-        if not existing_video: 
-            video = Video(
-                video_id=video_id,
-                title=title,
-                description=description,
-                category=category,
-                view_count=str(view_count),  
-                comment_count=str(comment_count),
-                like_count=str(like_count),
-                publish_date=publish_date,
-                channel_id=channel.id_channel  
-            )
-            session.add(video)
-            await session.flush()
-        else: 
-            video = existing_video
-        
+def _video_snapshot(rec: dict) -> dict:
+    return {
+        'video_id': rec['video_id'],
+        'view_count': rec['view_count'],
+        'like_count': rec['like_count'],
+        'comment_count': rec['comment_count']
+    }
+
+def _channel_snapshot(rec: dict) -> dict:
+    return {
+        'channel_id': rec['id_channel'],
+        'view_count': rec['view_count_channel'],
+        'subscription_count': rec['subscription_count'],
+        'video_count': rec['video_count']
+    }
+
+@connection
+async def insert_data_batch(records: list[dict], session: AsyncSession) -> list[str]:
+    """
+    Writes the records of one or many videos in a single transaction.
+    Each record holds the video, its channel and its comments (see YouTubeDataParser._build_record).
+    Errors are propagated so the caller can isolate the failing record.
+    """
+    channels = {
+        rec['id_channel']: {
+            'id_channel': rec['id_channel'],
+            'title_channel': rec['title_channel'],
+            'keywords': rec.get('keywords'),
+            'description_channel': rec.get('description_channel'),
+            'view_count_channel': rec['view_count_channel'],
+            'subscription_count': rec['subscription_count'],
+            'video_count': rec['video_count'],
+            'country': rec.get('country'),
+            'account_creation_date': rec['account_creation_date']
+        }
+        for rec in records
+    }
+    videos = {
+        rec['video_id']: {
+            'video_id': rec['video_id'],
+            'title': rec['title'],
+            'description': rec.get('description'),
+            'category': rec.get('category'),
+            'view_count': str(rec['view_count']),
+            'comment_count': str(rec['comment_count']),
+            'like_count': str(rec['like_count']),
+            'publish_date': rec['publish_date'],
+            'channel_id': rec['id_channel']
+        }
+        for rec in records
+    }
+
+    try:
+        await session.execute(pg_insert(Channel).values([channels[key] for key in sorted(channels)]).on_conflict_do_nothing())
+        await session.execute(pg_insert(Video).values([videos[key] for key in sorted(videos)]).on_conflict_do_nothing())
+
+        comment_values = [
+            _comment_values(com, rec['video_id'], rec['id_channel'])
+            for rec in records
+            for com in rec['comment_data']
+        ]
+
         # Create comment (batch_size = 1000 )
-        batch_size = 1000 
-        for i in range(0, len(comment_data), batch_size):
-            batch = comment_data[i:i + batch_size]
-            comment_values = [
+        inserted = defaultdict(list)
+        batch_size = 1000
+        for i in range(0, len(comment_values), batch_size):
+            stmt = (
+                pg_insert(Comment).values(comment_values[i:i + batch_size])
+                .on_conflict_do_nothing()
+                .returning(
+                    Comment.video_id,
+                    Comment.comment_publish_date,
+                    Comment.like_count,
+                    Comment.parent_comment_id,
+                    Comment.commenter_channel_id
+                )
+            )
+            for video_id, *row in (await session.execute(stmt)).all():
+                inserted[video_id].append(row)
+
+        stats = CommentStats()
+        for video_id, rows in inserted.items():
+            stats.add(rows, video_id, videos[video_id]['channel_id'])
+        await stats.flush(session)
+
+        await _append_snapshots(
+            session,
+            videos=[_video_snapshot(rec) for rec in {rec['video_id']: rec for rec in records}.values()],
+            channels=[_channel_snapshot(rec) for rec in {rec['id_channel']: rec for rec in records}.values()]
+        )
+
+        await session.commit()
+        return list(videos)
+    except Exception:
+        await session.rollback()
+        raise
+
+@connection
+async def load_complete_video_ids(index: KnownIdSet, session: AsyncSession) -> KnownIdSet:
+    """
+    Streams IDs of videos whose stored comments reach the comment_count reported by the API.
+    Stored counts are read from video_daily_stats, so legacy data needs --rebuild-aggregates first
+    (until then such videos are simply fetched again).
+    """
+    stored = (
+        select(
+            VideoDailyStats.video_id,
+            func.sum(VideoDailyStats.comment_count).label('stored_count')
+        )
+        .group_by(VideoDailyStats.video_id)
+        .subquery()
+    )
+    result = await session.stream_scalars(
+        select(Video.video_id)
+        .outerjoin(stored, stored.c.video_id == Video.video_id)
+        .where(func.coalesce(stored.c.stored_count, 0) >= cast(Video.comment_count, BigInteger))
+        .execution_options(yield_per=50000)
+    )
+    async for partition in result.partitions():
+        index.update(partition)
+    return index
+
+@connection
+async def load_comment_ids(index: KnownIdSet, video_ids: list[str], session: AsyncSession) -> KnownIdSet:
+    """Streams the stored comment IDs of the given videos into the index"""
+    if not video_ids:
+        return index
+    ids = bindparam('video_ids', value=list(video_ids), type_=ARRAY(String))
+    result = await session.stream_scalars(
+        select(Comment.comment_id)
+        .where(Comment.video_id == any_(ids))
+        .execution_options(yield_per=50000)
+    )
+    async for partition in result.partitions():
+        index.update(partition)
+    return index
+
+@connection
+async def select_poll_candidates(session: AsyncSession) -> list[tuple]:
+    """
+    Returns (video_id, publish_date, captured_at, view_count) rows with the two latest
+    snapshots of every stored video, newest first; videos without snapshots get one row of NULLs.
+    """
+    ranked = select(
+        VideoStatsSnapshot.video_id,
+        VideoStatsSnapshot.captured_at,
+        VideoStatsSnapshot.view_count,
+        func.row_number().over(
+            partition_by=VideoStatsSnapshot.video_id,
+            order_by=VideoStatsSnapshot.captured_at.desc()
+        ).label('rank')
+    ).subquery()
+
+    result = await session.execute(
+        select(Video.video_id, Video.publish_date, ranked.c.captured_at, ranked.c.view_count)
+        .outerjoin(ranked, and_(ranked.c.video_id == Video.video_id, ranked.c.rank <= 2))
+        .order_by(Video.video_id, ranked.c.captured_at.desc())
+    )
+    return result.all()
+
+@connection
+async def save_video_statistics(rows: list[dict], session: AsyncSession) -> int:
+    """Appends snapshots for polled videos and refreshes their current counters"""
+    if not rows:
+        return 0
+    try:
+        await _append_snapshots(session, videos=rows, channels=[])
+        await session.execute(
+            update(Video),
+            [
                 {
-                    'comment_id': com['comment_id'],
-                    'text': com['text'],
-                    'comment_publish_date': com['comment_publish_date'],
-                    'like_count': com['comment_like_count'],
-                    'reply_count': com.get('reply_count', 0),
-                    'video_id': video_id,
-                    'commenter_channel_id': com.get('commenter_channel_id', channel.id_channel),
-                    'parent_comment_id': com.get('comment_parent_id')
+                    'video_id': row['video_id'],
+                    'view_count': str(row['view_count']),
+                    'like_count': str(row['like_count']),
+                    'comment_count': str(row['comment_count'])
                 }
-                for com in batch
+                for row in rows
             ]
-            
-            stmt = pg_insert(Comment).values(comment_values).on_conflict_do_nothing()
-            await session.execute(stmt)
-        
+        )
         await session.commit()
-        return f'Created video ID {video.video_id}'
+        return len(rows)
+    except Exception:
+        await session.rollback()
+        raise
+
+@connection
+async def select_unseen_commenter_channels(limit: int, session: AsyncSession) -> list[str]:
+    """Commenter channel IDs missing from channels_metadata, most active commenters first"""
+    total = func.sum(CommenterStats.comment_count)
+    result = await session.scalars(
+        select(CommenterStats.commenter_channel_id)
+        .outerjoin(Channel, Channel.id_channel == CommenterStats.commenter_channel_id)
+        .where(Channel.id_channel.is_(None))
+        .group_by(CommenterStats.commenter_channel_id)
+        .order_by(total.desc())
+        .limit(limit)
+    )
+    return list(result.all())
 
-    except IntegrityError as e:
+@connection
+async def upsert_channels(rows: list[dict], session: AsyncSession) -> int:
+    """Inserts channels or refreshes their metadata, appending statistics snapshots"""
+    if not rows:
+        return 0
+    try:
+        stmt = pg_insert(Channel).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['id_channel'],
+            set_={
+                **{
+                    column: stmt.excluded[column]
+                    for column in rows[0]
+                    if column != 'id_channel'
+                },
+                'updated_at': func.now()
+            }
+        )
+        await session.execute(stmt)
+        await _append_snapshots(session, videos=[], channels=[
+            {
+                'channel_id': row['id_channel'],
+                'view_count': row['view_count_channel'],
+                'subscription_count': row['subscription_count'],
+                'video_count': row['video_count']
+            }
+            for row in rows
+        ])
+        await session.commit()
+        return len(rows)
+    except Exception:
         await session.rollback()
-        return f'Database integrity error: {str(e)}'
+        raise
+
+@connection
+async def rebuild_aggregates(session: AsyncSession) -> str:
+    """Recomputes all aggregate tables from the comments table (backfill)"""
+    try:
+        for model in (VideoDailyStats, ChannelDailyStats, CommenterStats):
+            await session.execute(delete(model))
+
+        day = cast(Comment.comment_publish_date, Date)
+        comment_count = func.count()
+        reply_count = func.count(Comment.parent_comment_id)
+        like_count = func.coalesce(func.sum(Comment.like_count), 0)
+
+        await session.execute(insert(VideoDailyStats).from_select(
+            ['video_id', 'day', 'comment_count', 'reply_count', 'like_count'],
+            select(Comment.video_id, day, comment_count, reply_count, like_count)
+            .where(Comment.video_id.is_not(None), Comment.comment_publish_date.is_not(None))
+            .group_by(Comment.video_id, day)
+        ))
+
+        await session.execute(insert(ChannelDailyStats).from_select(
+            ['channel_id', 'day', 'comment_count', 'reply_count', 'like_count'],
+            select(Video.channel_id, day, comment_count, reply_count, like_count)
+            .join(Video, Video.video_id == Comment.video_id)
+            .where(Video.channel_id.is_not(None), Comment.comment_publish_date.is_not(None))
+            .group_by(Video.channel_id, day)
+        ))
+
+        await session.execute(insert(CommenterStats).from_select(
+            ['channel_id', 'commenter_channel_id', 'comment_count', 'like_count', 'last_comment_date'],
+            select(
+                Video.channel_id,
+                Comment.commenter_channel_id,
+                comment_count,
+                like_count,
+                func.max(Comment.comment_publish_date)
+            )
+            .join(Video, Video.video_id == Comment.video_id)
+            .where(Video.channel_id.is_not(None), Comment.commenter_channel_id.is_not(None))
+            .group_by(Video.channel_id, Comment.commenter_channel_id)
+        ))
+
+        await session.commit()
+        return 'Aggregate tables rebuilt'
     except Exception as e:
         await session.rollback()
         return f'Error: {str(e)}'
\ No newline at end of file
@@ -0,0 +1,58 @@
+from controllers.database_controller import select_unseen_commenter_channels, upsert_channels
+from models.async_youtube_model import YouTubeDataModel
+from datetime import datetime
+
+class CommenterEnricher:
+    """
+    Fetches channels of commenters that are not stored yet.
+    Candidates come from the commenter_stats aggregate (most active first)
+    and are looked up with 50-ID channel requests within a quota budget.
+    """
+    BATCH_SIZE = 50  # channels per request, 1 quota unit each
+
+    def __init__(self, model: YouTubeDataModel, quota_budget: int = 100):
+        self.model = model
+        # Quota units spent per enrichment pass
+        self.quota_budget = quota_budget
+        # Deleted or hidden channels are not returned by the API, don't ask for them again
+        self.unresolved = set()
+
+    @staticmethod
+    def _channel_values(data: dict) -> dict | None:
+        """Converts channel metadata into channels_metadata columns"""
+        if not data.get('account_creation_date'):
+            return None
+        return {
+            'id_channel': data['channel_id'],
+            'title_channel': data.get('title') or '',
+            'keywords': data.get('keywords'),
+            'description_channel': data.get('description'),
+            'view_count_channel': int(data.get('view_count') or 0),
+            'subscription_count': int(data.get('subscription_count') or 0),
+            'video_count': int(data.get('video_count') or 0),
+            'country': data.get('country'),
+            'account_creation_date': datetime.fromtimestamp(data['account_creation_date'])
+        }
+
+    async def enrich(self) -> int:
+        """Runs one enrichment pass, returns the number of channels stored"""
+        limit = self.quota_budget * self.BATCH_SIZE
+        candidates = await select_unseen_commenter_channels(limit=limit + len(self.unresolved))
+        channel_ids = [channel_id for channel_id in candidates if channel_id not in self.unresolved][:limit]
+
+        stored = 0
+        for i in range(0, len(channel_ids), self.BATCH_SIZE):
+            batch = channel_ids[i:i + self.BATCH_SIZE]
+            try:
+                metadata = await self.model.get_channels_metadata(batch)
+            except Exception as e:
+                print(f"Error occurred: {e}")
+                continue
+
+            rows = {}
+            for data in metadata:
+                if values := self._channel_values(data):
+                    rows[values['id_channel']] = values
+            self.unresolved.update(channel_id for channel_id in batch if channel_id not in rows)
+            stored += await upsert_channels(rows=list(rows.values()))
+        return stored
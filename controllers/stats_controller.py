@@ -0,0 +1,129 @@
+from controllers.database_controller import select_poll_candidates, save_video_statistics
+from models.async_youtube_model import YouTubeDataModel
+from datetime import datetime, timedelta
+from itertools import groupby
+import asyncio
+
+class StatsPoller:
+    """
+    Re-polls statistics of stored videos within a quota allowance shared by all passes of a 24-hour window.
+    The polling interval of each video follows its growth rate:
+    fast growing videos are polled often, dormant ones rarely.
+    """
+    BATCH_SIZE = 50  # videos per request, 1 quota unit each
+
+    def __init__(self,
+                 model: YouTubeDataModel,
+                 daily_quota: int = 1000,
+                 target_growth: float = 0.02,
+                 min_interval: timedelta = timedelta(hours=1),
+                 max_interval: timedelta = timedelta(days=30),
+                 default_interval: timedelta = timedelta(days=1),
+                 new_video_age: timedelta = timedelta(days=7)):
+        self.model = model
+        # Quota units per 24 hours, well below the default 10,000 so crawling keeps the rest
+        self.daily_quota = daily_quota
+        self.quota_window_start = None
+        self.quota_spent = 0
+        # Poll again when the view count is expected to grow by this share
+        self.target_growth = target_growth
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.new_video_age = new_video_age
+        # Deleted or private videos are not returned by the API, don't ask for them again
+        self.unresolved = set()
+
+    def quota_left(self, now: datetime | None = None) -> int:
+        """Quota units left in the current 24-hour window, a new window starts once it has passed"""
+        now = now or datetime.now()
+        if self.quota_window_start is None or now - self.quota_window_start >= timedelta(days=1):
+            self.quota_window_start = now
+            self.quota_spent = 0
+        return max(self.daily_quota - self.quota_spent, 0)
+
+    def next_interval(self, publish_date: datetime | None, snapshots: list[tuple], now: datetime) -> timedelta:
+        """Interval from the two latest (captured_at, view_count) snapshots, newest first"""
+        if len(snapshots) < 2:
+            if publish_date and now - publish_date < self.new_video_age:
+                return self.min_interval
+            return self.default_interval
+
+        (last_at, last_views), (prev_at, prev_views) = snapshots[:2]
+        hours = (last_at - prev_at).total_seconds() / 3600
+        growth = (last_views - prev_views) / max(prev_views, 1)
+        if hours <= 0 or growth <= 0:
+            return self.max_interval
+
+        interval = timedelta(hours=self.target_growth * hours / growth)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    async def due_videos(self, now: datetime | None = None) -> list[str]:
+        """
+        Video IDs due for polling, most overdue first, cut to the quota left in the window.
+        Every stored video with its two latest snapshots is loaded and ranked in Python on each pass,
+        which is fine for tens of thousands of videos; beyond that the due filter belongs in SQL.
+        """
+        now = now or datetime.now()
+        due = []
+        for video_id, rows in groupby(await select_poll_candidates(), key=lambda row: row[0]):
+            if video_id in self.unresolved:
+                continue
+            rows = list(rows)
+            publish_date = rows[0][1]
+            snapshots = [(captured_at, views) for _, _, captured_at, views in rows if captured_at is not None]
+            if not snapshots:
+                due.append((float('inf'), video_id))
+                continue
+            interval = self.next_interval(publish_date, snapshots, now)
+            overdue = (now - snapshots[0][0]) / interval
+            if overdue >= 1:
+                due.append((overdue, video_id))
+
+        due.sort(reverse=True)
+        return [video_id for _, video_id in due[:self.quota_left(now) * self.BATCH_SIZE]]
+
+    async def poll_due(self) -> int:
+        """
+        Polls the due videos with batched metadata requests, returns the number of snapshots saved.
+        Every request is charged to the window allowance, failed ones included; polling stops when it runs out.
+        """
+        video_ids = await self.due_videos()
+        saved = 0
+        for i in range(0, len(video_ids), self.BATCH_SIZE):
+            if not self.quota_left():
+                break
+            self.quota_spent += 1
+            batch = video_ids[i:i + self.BATCH_SIZE]
+            try:
+                metadata = await self.model.get_videos_metadata(batch)
+            except Exception as e:
+                print(f"Error occurred: {e}")
+                continue
+
+            # Missing videos come back as empty entries
+            rows = {
+                data['video_id']: {
+                    'video_id': data['video_id'],
+                    'view_count': int(data.get('video_view_count') or 0),
+                    'like_count': int(data.get('video_like_count') or 0),
+                    'comment_count': int(data.get('video_comment_count') or 0)
+                }
+                for data in metadata
+                if data and data.get('video_id')
+            }
+            self.unresolved.update(video_id for video_id in batch if video_id not in rows)
+            saved += await save_video_statistics(rows=list(rows.values()))
+        return saved
+
+    async def run(self, check_every: float = 600, on_pass=None) -> None:
+        """Polls due videos periodically until cancelled, reporting each pass to on_pass(saved)"""
+        while True:
+            try:
+                saved = await self.poll_due()
+            except Exception as e:
+                print(f"Error occurred: {e}")
+                saved = 0
+            if on_pass:
+                on_pass(saved)
+            await asyncio.sleep(check_every)
@@ -0,0 +1,108 @@
+from controllers.database_controller import insert_data_batch
+from models.known_ids import KnownIdSet
+import asyncio
+
+class DatabaseWriter:
+    """
+    Consumer stage of the fetch/write pipeline.
+    Fetchers submit converted video records into a bounded queue, writer tasks
+    coalesce records of many videos into one transaction, flushing by size or time.
+    """
+    def __init__(self,
+                 batch_size: int = 25,
+                 max_comments: int = 5000,
+                 flush_interval: float = 2.0,
+                 queue_size: int = 50,
+                 workers: int = 1,
+                 complete_videos: KnownIdSet | None = None,
+                 known_comments: KnownIdSet | None = None):
+        self.batch_size = batch_size
+        self.max_comments = max_comments
+        self.flush_interval = flush_interval
+        self.workers = workers
+        # Refreshed after each commit; known comments are dropped before they are queued
+        self.complete_videos = complete_videos
+        self.known_comments = known_comments
+
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.tasks = []
+
+    def start(self) -> None:
+        """Starts the writer tasks on the running event loop"""
+        if not self.tasks:
+            self.tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def submit(self, record: dict) -> asyncio.Future:
+        """Queues a record and returns a future resolved once it is committed"""
+        # All comments of the video are stored once this record is committed
+        complete = len(record['comment_data']) >= record['comment_count']
+        if self.known_comments is not None:
+            known = self.known_comments
+            record['comment_data'] = [
+                comment for comment in record['comment_data']
+                if comment['comment_id'] not in known
+            ]
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((record, future, complete))  # Waits while the queue is full
+        return future
+
+    async def close(self) -> None:
+        """Flushes everything that was submitted and stops the writer tasks"""
+        for _ in self.tasks:
+            await self.queue.put(None)
+        await asyncio.gather(*self.tasks)
+        self.tasks = []
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopped = False
+        while not stopped:
+            item = await self.queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            comments = len(item[0]['comment_data'])
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size and comments < self.max_comments:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopped = True
+                    break
+                batch.append(item)
+                comments += len(item[0]['comment_data'])
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[tuple]) -> None:
+        """Writes a batch in one transaction; on failure isolates the bad records one by one"""
+        try:
+            await insert_data_batch(records=[record for record, _, _ in batch])
+            for record, future, complete in batch:
+                self._remember(record, complete)
+                if not future.done():
+                    future.set_result(f"Created video ID {record['video_id']}")
+            return
+        except Exception as e:
+            if len(batch) == 1:
+                record, future, _ = batch[0]
+                if not future.done():
+                    future.set_exception(e)
+                return
+            print(f"Batch write failed, retrying records one by one: {e}")
+
+        for item in batch:
+            await self._flush([item])
+
+    def _remember(self, record: dict, complete: bool) -> None:
+        """Adds a committed record to the known-ID indexes"""
+        if complete and self.complete_videos is not None:
+            self.complete_videos.add(record['video_id'])
+        if self.known_comments is not None:
+            self.known_comments.update(comment['comment_id'] for comment in record['comment_data'])
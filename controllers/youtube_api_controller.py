@@ -1,5 +1,9 @@
-from controllers.database_controller import insert_data_api
-from models.async_youtube_model import YouTubeDataModel
+from controllers.database_controller import insert_data_batch, load_complete_video_ids, load_comment_ids
+from controllers.writer_controller import DatabaseWriter
+from controllers.stats_controller import StatsPoller
+from controllers.enrichment_controller import CommenterEnricher
+from models.async_youtube_model import YouTubeDataModel, YouTubeValidator
+from models.known_ids import KnownIdSet
 import asyncio
 from datetime import datetime
 
@@ -10,6 +14,21 @@ class YouTubeDataParser:
 
         self.semaphore = asyncio.Semaphore(5)
 
+        # Videos stored with all their comments, prewarmed once and refreshed by the writer
+        self.complete_videos = KnownIdSet()
+        self.complete_videos_loaded = False
+
+        self.stats_poller = StatsPoller(model=self.cor)
+        self.polling_task = None
+        self.commenter_enricher = CommenterEnricher(model=self.cor)
+
+        # Pause / resume / cancel of a running crawl
+        self.resume_event = asyncio.Event()
+        self.resume_event.set()
+        self.crawling = False
+        self.cancelled = False
+        self.worker_tasks = []
+
     async def search_videos(self,
                 query: str,
                 date_after: datetime = datetime(2005, 2, 14).strftime("%Y-%m-%d"),  
@@ -30,50 +49,214 @@ class YouTubeDataParser:
             print(f"Error occurred: {e}")
             return None 
 
-    async def create_data_video(self, video_id):
+    async def warm_known_ids(self) -> KnownIdSet:
+        """Loads IDs of completely stored videos into the in-memory index (once per session)"""
+        if not self.complete_videos_loaded:
+            await load_complete_video_ids(index=self.complete_videos)
+            self.complete_videos_loaded = True
+        return self.complete_videos
+
+    async def filter_known(self, video_ids: list[str]) -> list[str]:
+        """
+        Drops the videos that are stored together with all their comments, without a database round trip.
+        Stored videos with missing comments are kept, their stored comments are dropped by the writer.
+        """
+        complete = await self.warm_known_ids()
+        return [video_id for video_id in video_ids if video_id not in complete]
+
+    async def poll_statistics(self) -> int:
+        """Takes statistics snapshots of the videos that are due for re-polling"""
+        try:
+            return await self.stats_poller.poll_due()
+        except Exception as e:
+            print(f"Error occurred: {e}")
+            return 0
+
+    def start_auto_polling(self, on_pass=None) -> bool:
+        """Starts periodic statistics polling on the running loop; False if it is already running"""
+        if self.polling_task and not self.polling_task.done():
+            return False
+        self.polling_task = asyncio.create_task(self.stats_poller.run(on_pass=on_pass))
+        return True
+
+    def stop_auto_polling(self) -> bool:
+        """Stops periodic statistics polling; False if it was not running"""
+        if not self.polling_task or self.polling_task.done():
+            return False
+        self.polling_task.cancel()
+        self.polling_task = None
+        return True
+
+    async def enrich_commenters(self) -> int:
+        """Stores channels of the most active commenters that are not in the database yet"""
+        try:
+            return await self.commenter_enricher.enrich()
+        except Exception as e:
+            print(f"Error occurred: {e}")
+            return 0
+
+    async def channel_videos(self, channel: str) -> list[str]:
+        """Collects the uploads of a channel (1 quota unit per 50 videos); errors are raised"""
+        self.list_videos_id = await self.cor.get_channel_upload_ids(channel)
+        return self.list_videos_id
+
+    async def import_videos(self, path: str) -> tuple[list[str], int]:
+        """
+        Collects unique video IDs from a file (one URL or ID per line, or CSV rows);
+        returns the IDs and the number of skipped lines, errors are raised
+        """
+        with open(path, encoding='utf-8') as file:
+            self.list_videos_id, skipped = YouTubeValidator.extract_video_ids(file)
+        return self.list_videos_id, skipped
+
+    @staticmethod
+    def _build_record(data_comment: list[dict], data_video: dict, data_channel: dict) -> dict:
+        """Converts raw API responses into a record for insert_data_batch"""
+        comment_data = [
+            {
+                'comment_id': comment['comment_id'],
+                'text': comment['text'],
+                'comment_publish_date': datetime.fromtimestamp(comment['comment_publish_date']),
+                'comment_like_count': comment['comment_like_count'],
+                'reply_count': comment.get('reply_count', 0),
+                'commenter_channel_id': comment['commenter_channel_id'],
+                'comment_parent_id': comment.get('comment_parent_id')
+            }
+            for comment in data_comment
+        ]
+
+        return dict(
+            comment_data=comment_data,
+            video_id=data_video['video_id'],
+            title=data_video['video_title'],
+            view_count=int(data_video['video_view_count']),
+            comment_count=int(data_video['video_comment_count']),
+            like_count=int(data_video['video_like_count']),
+            publish_date=datetime.fromtimestamp(data_video['video_publish_date']),
+            channel_id=data_video['channel_id'],
+            description=data_video.get('video_description'),
+            category=data_video.get('video_category'),
+            id_channel=data_channel['channel_id'],
+            title_channel=data_channel['title'],
+            view_count_channel=int(data_channel['view_count']),
+            subscription_count=int(data_channel['subscription_count']),
+            video_count=int(data_channel['video_count']),
+            account_creation_date=datetime.fromtimestamp(data_channel['account_creation_date']),
+            country=data_channel.get('country'),
+            keywords=data_channel.get('keywords'),
+            description_channel=data_channel.get('description')
+        )
+
+    async def fetch_data_video(self, video_id: str) -> dict:
+        """Fetches comments, video and channel metadata and converts them into a record"""
         async with self.semaphore: # Using a semaphore
+            data_comment, data_video = await asyncio.gather(
+                self.cor.get_video_comments(video_id=video_id), 
+                self.cor.get_video_metadata(video_id=video_id)
+            )
+            data_channel = await self.cor.get_channel_metadata(channel_id=str(data_video['channel_id']))
+        return self._build_record(data_comment, data_video, data_channel)
+
+    async def create_data_video(self, video_id):
+        try:
+            record = await self.fetch_data_video(video_id)
+            await insert_data_batch(records=[record])
+            if len(record['comment_data']) >= record['comment_count']:
+                self.complete_videos.add(record['video_id'])
+            return f"Created video ID {record['video_id']}"
+        except Exception as e:
+            print(f"Error occurred: {e}")
+            return False
+
+    def pause(self) -> bool:
+        """Stops workers from taking new videos (in-flight ones are finished); False if no crawl is running"""
+        if not self.crawling:
+            return False
+        self.resume_event.clear()
+        return True
+
+    def resume(self) -> bool:
+        """Lets paused workers continue; False if no crawl is running"""
+        if not self.crawling:
+            return False
+        self.resume_event.set()
+        return True
+
+    def cancel(self) -> bool:
+        """
+        Stops the running crawl. In-flight fetches are dropped, records already
+        handed to the writer are still committed, so no transaction is left half-written.
+        """
+        if not self.crawling:
+            return False
+        self.cancelled = True
+        self.resume_event.set()
+        for task in self.worker_tasks:
+            task.cancel()
+        return True
+
+    async def stream_videos(self, video_ids: list[str], workers: int = 5):
+        """
+        Processes videos with a bounded worker pool and yields (video_id, result) as they complete.
+        Workers pull IDs lazily; a worker is free again as soon as its record is queued for the
+        coalescing DB writer, so API requests overlap with the writes of previous videos.
+        Only one crawl runs at a time, pause / resume / cancel act on it.
+        """
+        if self.crawling:
+            raise RuntimeError("Processing is already running")
+        self.crawling = True
+        self.cancelled = False
+        self.resume_event.set()
+
+        try:
+            # Incomplete videos may already have stored comments, drop those before writing
+            complete = await self.warm_known_ids()
+            known_comments = await load_comment_ids(index=KnownIdSet(), video_ids=video_ids)
+
+            writer = DatabaseWriter(complete_videos=complete, known_comments=known_comments)
+            writer.start()
+
+            results = asyncio.Queue()
+            written = set()
+            pending_ids = iter(video_ids)
+
+            def report(video_id, future):
+                failed = future.cancelled() or future.exception() is not None
+                results.put_nowait((video_id, False if failed else future.result()))
+
+            async def worker():
+                for video_id in pending_ids:
+                    await self.resume_event.wait()
+                    if self.cancelled:
+                        break
+                    try:
+                        record = await self.fetch_data_video(video_id)
+                        future = await writer.submit(record)
+                    except Exception as e:
+                        print(f"Error occurred: {e}")
+                        results.put_nowait((video_id, False))
+                        continue
+                    written.add(future)
+                    future.add_done_callback(lambda f, video_id=video_id: report(video_id, f))
+
+            async def produce():
+                try:
+                    await asyncio.gather(*self.worker_tasks, return_exceptions=True)
+                finally:
+                    # Commit everything that was handed over before signalling the end
+                    await writer.close()
+                    await asyncio.gather(*written, return_exceptions=True)
+                    asyncio.get_running_loop().call_soon(results.put_nowait, None)
+
+            self.worker_tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+            producer = asyncio.create_task(produce())
             try:
-                data_comment, data_video, data_channel = await asyncio.gather(
-                    self.cor.get_video_comments(video_id=video_id), 
-                    self.cor.get_video_metadata(),
-                    self.cor.get_channel_metadata()
-                )
-
-                comment_data = [
-                    {
-                        'comment_id': comment['comment_id'],
-                        'text': comment['text'],
-                        'comment_publish_date': datetime.fromtimestamp(comment['comment_publish_date']),
-                        'comment_like_count': comment['comment_like_count'],
-                        'reply_count': comment.get('reply_count', 0),
-                        'commenter_channel_id': comment['commenter_channel_id'],
-                        'comment_parent_id': comment.get('comment_parent_id')
-                    }
-                    for comment in data_comment
-                ]
-
-                result = await insert_data_api(
-                    comment_data=comment_data,
-                    video_id=data_video['video_id'],
-                    title=data_video['video_title'],
-                    view_count=int(data_video['video_view_count']),
-                    comment_count=int(data_video['video_comment_count']),
-                    like_count=int(data_video['video_like_count']),
-                    publish_date=datetime.fromtimestamp(data_video['video_publish_date']),
-                    channel_id=data_video['channel_id'],
-                    description=data_video.get('video_description'),
-                    category=data_video.get('video_category'),
-                    id_channel=data_channel['channel_id'],
-                    title_channel=data_channel['title'],
-                    view_count_channel=int(data_channel['view_count']),
-                    subscription_count=int(data_channel['subscription_count']),
-                    video_count=int(data_channel['video_count']),
-                    account_creation_date=datetime.fromtimestamp(data_channel['account_creation_date']),
-                    country=data_channel.get('country'),
-                    keywords=data_channel.get('keywords'),
-                    description_channel=data_channel.get('description')
-                )
-                return result
-            except Exception as e:
-                print(f"Error occurred: {e}")
-                return False
\ No newline at end of file
+                while (item := await results.get()) is not None:
+                    yield item
+            finally:
+                if not producer.done():
+                    self.cancel()
+                await producer
+        finally:
+            self.worker_tasks = []
+            self.crawling = False
\ No newline at end of file
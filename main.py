@@ -1,7 +1,19 @@
+import argparse
+import asyncio
 import tkinter as tk
 from view.layout import YouTubeAsyncApp 
 
 def main():
+    parser = argparse.ArgumentParser(description="YouTube Data Collector")
+    parser.add_argument("--rebuild-aggregates", action="store_true",
+                        help="recompute aggregate tables from stored comments and exit")
+    args = parser.parse_args()
+
+    if args.rebuild_aggregates:
+        from controllers.database_controller import rebuild_aggregates
+        print(asyncio.run(rebuild_aggregates()))
+        return
+
     root = tk.Tk()
     YouTubeAsyncApp(root)
     root.mainloop()
@@ -1,25 +1,88 @@
 from youtube_api import YouTubeDataAPI
+import requests
 from typing import List, Optional
 from functools import lru_cache
 from datetime import datetime
+from urllib.parse import unquote
+import asyncio
 import re
 
+# Compiled once, bulk imports extract thousands of IDs
+VIDEO_ID_RE = re.compile(r'^[0-9A-Za-z_-]{11}$')
+VIDEO_URL_PATTERNS = (
+    re.compile(r"(?:v=|\/)([0-9A-Za-z_-]{11})"),
+    re.compile(r"youtu\.be\/([0-9A-Za-z_-]{11})")
+)
+# Strict form for file import: only real watch / shorts / embed / live / youtu.be links
+VIDEO_LINK_RE = re.compile(
+    r"(?:youtube\.com\/(?:watch\?(?:[^#\s]*&)?v=|shorts\/|embed\/|live\/)|youtu\.be\/)"
+    r"([0-9A-Za-z_-]{11})(?![0-9A-Za-z_-])"
+)
+CSV_DELIMITER_RE = re.compile(r"[,;\t]")
+CHANNEL_ID_RE = re.compile(r"(UC[0-9A-Za-z_-]{22})")
+# Handles may be non-Latin, anything up to the next path / query / fragment separator
+CHANNEL_HANDLE_RE = re.compile(r"(?:^|youtube\.com\/)(@[^\/?#\s]+)")
+CHANNEL_USER_RE = re.compile(r"youtube\.com\/user\/([^\/?#\s]+)")
+CHANNELS_URL = 'https://www.googleapis.com/youtube/v3/channels'
+
 class YouTubeValidator:
     @staticmethod
     def _sync_extract_video_id(url_or_id: str) -> Optional[str]:
         """Synchronous implementation of ID extraction"""
-        if len(url_or_id) == 11 and re.match(r'^[0-9A-Za-z_-]{11}$', url_or_id):
+        if len(url_or_id) == 11 and VIDEO_ID_RE.match(url_or_id):
             return url_or_id
             
-        patterns = [
-            r"(?:v=|\/)([0-9A-Za-z_-]{11})",
-            r"youtu\.be\/([0-9A-Za-z_-]{11})"
-        ]
-        for pattern in patterns:
-            if match := re.search(pattern, url_or_id):
+        for pattern in VIDEO_URL_PATTERNS:
+            if match := pattern.search(url_or_id):
                 return match.group(1)
         return None
 
+    @staticmethod
+    def extract_video_ids(lines) -> tuple[list[str], int]:
+        """
+        Extracts video IDs from lines holding a bare ID or a video link; CSV rows are split
+        on , ; or tab and the first field with an ID is taken. Blanks and duplicates are dropped
+        (order is kept). Returns the IDs and the number of non-empty lines without an ID.
+        """
+        unique = {}
+        skipped = 0
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            for field in CSV_DELIMITER_RE.split(line):
+                field = field.strip().strip('"\'')
+                if VIDEO_ID_RE.match(field):
+                    unique[field] = None
+                    break
+                if match := VIDEO_LINK_RE.search(field):
+                    unique[match.group(1)] = None
+                    break
+            else:
+                skipped += 1
+        return list(unique), skipped
+
+    @staticmethod
+    def extract_channel_id(url_or_id: str) -> Optional[str]:
+        """Extracts the channel ID (UC...) from a channel URL or ID"""
+        if match := CHANNEL_ID_RE.search(url_or_id.strip()):
+            return match.group(1)
+        return None
+
+    @staticmethod
+    def extract_channel_handle(url_or_handle: str) -> Optional[str]:
+        """Extracts the channel handle (@name) from a channel URL or handle, percent-encoding is decoded"""
+        if match := CHANNEL_HANDLE_RE.search(unquote(url_or_handle.strip())):
+            return match.group(1)
+        return None
+
+    @staticmethod
+    def extract_channel_username(url: str) -> Optional[str]:
+        """Extracts the legacy username from a youtube.com/user/... URL"""
+        if match := CHANNEL_USER_RE.search(unquote(url.strip())):
+            return match.group(1)
+        return None
+
     @staticmethod
     def validate_query(q: str) -> str:
         """Validates that the search query is not empty and contains at least 2 non-whitespace characters."""
@@ -56,6 +119,7 @@ class YouTubeValidator:
 class YouTubeDataModel:
     def __init__(self, api_key: str):
         self.YT = self._create_client(api_key)
+        self.api_key = api_key
         self.video_id = None 
         self.channel_id = None
 
@@ -68,6 +132,14 @@ class YouTubeDataModel:
     def set_video_id(self, video_id: str) -> None:
         """Sets the video ID for subsequent operations"""
         self.video_id = YouTubeValidator._sync_extract_video_id(video_id)
+
+    def _resolve_video_id(self, video_id: str | None) -> str:
+        """Returns the ID to request, captured before the call leaves the event loop"""
+        if video_id:
+            self.set_video_id(video_id)
+        if not self.video_id:
+            raise ValueError("Video ID is not set")
+        return self.video_id
         
     async def search_youtube_videos(
             self,
@@ -84,7 +156,8 @@ class YouTubeDataModel:
         valid = YouTubeValidator
 
         try:
-            data = self.YT.search(
+            data = await asyncio.to_thread(
+                self.YT.search,
                 q=valid.validate_query(q=query),
                 max_results=valid.validate_max_results(max_results=max_results), 
                 order_by='viewCount',
@@ -103,13 +176,12 @@ class YouTubeDataModel:
 
     async def get_video_comments(self, video_id: str = None) -> List[dict]:
         """Retrieves comments for the specified video"""
-        if video_id:
-            self.set_video_id(video_id)
-        elif not self.video_id:
-            raise ValueError("Video ID is not set")
+        video_id = self._resolve_video_id(video_id)
         try:
-            return self.YT.get_video_comments(
-                video_id=self.video_id,
+            # The client is blocking, run it in a thread to keep the event loop free
+            return await asyncio.to_thread(
+                self.YT.get_video_comments,
+                video_id=video_id,
                 part=['snippet']
             )
         except Exception as e:
@@ -117,13 +189,11 @@ class YouTubeDataModel:
         
     async def get_video_metadata(self, video_id: str = None)-> List[dict]:
         """Retrieves metadata for the specified video"""
-        if video_id:
-            self.set_video_id(video_id)
-        elif not self.video_id:
-            raise ValueError("Video ID is not set")
+        video_id = self._resolve_video_id(video_id)
         try:
-            metadata = self.YT.get_video_metadata(
-                video_id=self.video_id, 
+            metadata = await asyncio.to_thread(
+                self.YT.get_video_metadata,
+                video_id=video_id, 
                 part=['statistics', 'snippet']  
             )
             self.channel_id = str(metadata['channel_id']) # extract channel_id
@@ -137,12 +207,96 @@ class YouTubeDataModel:
         if not channel_id:
             raise ValueError('Channel ID not found. Enter it manually or call get_video_metadata first')
         try:
-            return self.YT.get_channel_metadata(
+            return await asyncio.to_thread(
+                self.YT.get_channel_metadata,
                 channel_id=channel_id,
                 part=[
                     "id", "snippet", "contentDetails", 
                     "statistics", "topicDetails", "brandingSettings"
                 ] 
             )
+        except Exception as e:
+            raise RuntimeError(f"Error fetching channel metadata: {e}")
+
+    def _sync_channel_id_by(self, lookup: str, value: str) -> Optional[str]:
+        """channels.list by forHandle / forUsername (1 quota unit), the client library has no such lookup"""
+        response = requests.get(
+            CHANNELS_URL,
+            params={'part': 'id', lookup: value, 'key': self.api_key},
+            timeout=30
+        )
+        response.raise_for_status()
+        items = response.json().get('items') or []
+        return items[0]['id'] if items else None
+
+    async def resolve_channel_id(self, url_or_id: str) -> str:
+        """
+        Returns the channel ID for a channel ID, @handle, /@handle or /user/ URL.
+        Custom /c/ URLs have no API lookup and are not supported.
+        """
+        if channel_id := YouTubeValidator.extract_channel_id(url_or_id):
+            return channel_id
+
+        if handle := YouTubeValidator.extract_channel_handle(url_or_id):
+            lookup, value = 'forHandle', handle
+        elif username := YouTubeValidator.extract_channel_username(url_or_id):
+            lookup, value = 'forUsername', username
+        else:
+            raise ValueError('Enter a channel ID (UC...), @handle, /@handle or /user/ URL '
+                             '(custom /c/ URLs are not supported)')
+
+        try:
+            channel_id = await asyncio.to_thread(self._sync_channel_id_by, lookup, value)
+        except Exception as e:
+            raise RuntimeError(f"Error resolving channel {value}: {e}")
+        if not channel_id:
+            raise ValueError(f"Channel {value} not found")
+        return channel_id
+
+    async def get_channel_upload_ids(self, channel_id: str) -> list[str]:
+        """
+        Enumerates all uploads of a channel through its uploads playlist.
+        Costs 1 quota unit per page of 50 videos instead of 100 units per search call.
+        """
+        channel_id = await self.resolve_channel_id(channel_id)
+        # The uploads playlist of channel UCxxx is UUxxx
+        playlist_id = 'UU' + channel_id[2:]
+        try:
+            items = await asyncio.to_thread(
+                self.YT.get_videos_from_playlist_id,
+                playlist_id=playlist_id
+            )
+            return list(dict.fromkeys(item['video_id'] for item in items))
+        except Exception as e:
+            raise RuntimeError(f"Error fetching channel uploads: {e}")
+
+    async def get_videos_metadata(self, video_ids: list[str]) -> list[dict]:
+        """Retrieves metadata of up to 50 videos in one request (1 quota unit)"""
+        if not 0 < len(video_ids) <= 50:
+            raise ValueError('Batch must contain from 1 to 50 video IDs')
+        try:
+            metadata = await asyncio.to_thread(
+                self.YT.get_video_metadata,
+                video_id=list(video_ids),
+                part=['statistics', 'snippet']
+            )
+            return [metadata] if isinstance(metadata, dict) else list(metadata)
+        except Exception as e:
+            raise RuntimeError(f"Error fetching video metadata: {e}")
+
+    async def get_channels_metadata(self, channel_ids: list[str]) -> list[dict]:
+        """Retrieves metadata of up to 50 channels in one request (1 quota unit)"""
+        if not 0 < len(channel_ids) <= 50:
+            raise ValueError('Batch must contain from 1 to 50 channel IDs')
+        try:
+            metadata = await asyncio.to_thread(
+                self.YT.get_channel_metadata,
+                channel_id=list(channel_ids),
+                part=[
+                    "id", "snippet", "contentDetails", 
+                    "statistics", "topicDetails", "brandingSettings"
+                ]
+            )
+            return [metadata] if isinstance(metadata, dict) else list(metadata)
         except Exception as e:
             raise RuntimeError(f"Error fetching channel metadata: {e}")
\ No newline at end of file
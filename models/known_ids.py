@@ -0,0 +1,75 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+class KnownIdSet:
+    """
+    Memory-compact membership set of string IDs (video IDs, comment IDs).
+    IDs are kept as 64-bit hashes (8 bytes per ID instead of a str object) in a few sorted
+    runs of geometrically decreasing size (levelled merge), so bulk loading stays close to linear;
+    single IDs added by the writer go to a small pending set first. An ID added twice in separate
+    calls may be stored twice, which costs memory only.
+    A hash collision may report an unseen ID as known, with a probability of about n / 2**64.
+    """
+    def __init__(self, merge_threshold: int = 100_000):
+        self.merge_threshold = merge_threshold
+        self._runs = []  # sorted arrays, largest first
+        self._pending = set()
+
+    # The built-in str hash is computed in C and cached on the string; it is salted per process,
+    # which is fine because the index lives in memory only
+    _MASK = 2 ** 64 - 1
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        return hash(value) & KnownIdSet._MASK
+
+    def add(self, value: str) -> None:
+        """Adds one ID (incremental refresh)"""
+        self._pending.add(self._hash(value))
+        if len(self._pending) >= self.merge_threshold:
+            self._flush_pending()
+
+    def update(self, values: Iterable[str]) -> None:
+        """Adds many IDs: hashed, sorted and deduplicated once, then stored as one run"""
+        mask = self._MASK
+        self._add_run({key & mask for key in map(hash, values)})
+
+    @staticmethod
+    def _in_run(run: array, key: int) -> bool:
+        i = bisect_left(run, key)
+        return i < len(run) and run[i] == key
+
+    def _in_runs(self, key: int) -> bool:
+        return any(self._in_run(run, key) for run in self._runs)
+
+    def __contains__(self, value: str) -> bool:
+        key = self._hash(value)
+        return key in self._pending or self._in_runs(key)
+
+    def __len__(self) -> int:
+        self._flush_pending()
+        return len(set().union(*self._runs))
+
+    def _flush_pending(self) -> None:
+        """Moves pending hashes into a run"""
+        if self._pending:
+            keys, self._pending = self._pending, set()
+            self._add_run(keys)
+
+    def _add_run(self, keys: set) -> None:
+        """Stores new hashes as a sorted run and merges runs of similar size"""
+        if not keys:
+            return
+        self._runs.append(array('Q', sorted(keys)))
+        # A run is merged into the previous one while it is at least half its size,
+        # so every hash takes part in O(log n) merges and only O(log n) runs exist
+        while len(self._runs) > 1 and 2 * len(self._runs[-1]) >= len(self._runs[-2]):
+            self._merge_last()
+
+    def _merge_last(self) -> None:
+        """Merges the two smallest runs"""
+        smaller = self._runs.pop()
+        larger = self._runs.pop()
+        # Both runs are sorted: timsort merges the concatenation in one linear pass
+        self._runs.append(array('Q', sorted(larger + smaller)))
@@ -1,8 +1,8 @@
 from models.database import Base
-from sqlalchemy import DateTime, String, Integer, BigInteger, Text, ForeignKey
+from sqlalchemy import Date, DateTime, String, Integer, BigInteger, Text, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from datetime import datetime
+from datetime import date, datetime
 
 class Comment(Base):
     __tablename__ = 'comments'
@@ -94,4 +94,49 @@ class Channel(Base):
         'Video',
         back_populates='channel',
         lazy="dynamic"
-    )
\ No newline at end of file
+    )
+
+class VideoDailyStats(Base):
+    __tablename__ = 'video_daily_stats'
+
+    video_id: Mapped[str] = mapped_column(String(255), ForeignKey('videos_metadata.video_id'), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    comment_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    reply_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    like_count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+class ChannelDailyStats(Base):
+    __tablename__ = 'channel_daily_stats'
+
+    channel_id: Mapped[str] = mapped_column(String(255), ForeignKey('channels_metadata.id_channel'), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    comment_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    reply_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    like_count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+class CommenterStats(Base):
+    __tablename__ = 'commenter_stats'
+
+    channel_id: Mapped[str] = mapped_column(String(255), ForeignKey('channels_metadata.id_channel'), primary_key=True)
+    commenter_channel_id: Mapped[str] = mapped_column(String(255), primary_key=True, index=True)
+    comment_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    like_count: Mapped[int] = mapped_column(BigInteger, default=0)
+    last_comment_date: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+class VideoStatsSnapshot(Base):
+    __tablename__ = 'video_stats_snapshots'
+
+    video_id: Mapped[str] = mapped_column(String(255), ForeignKey('videos_metadata.video_id'), primary_key=True)
+    captured_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    view_count: Mapped[int] = mapped_column(BigInteger)
+    like_count: Mapped[int] = mapped_column(BigInteger)
+    comment_count: Mapped[int] = mapped_column(BigInteger)
+
+class ChannelStatsSnapshot(Base):
+    __tablename__ = 'channel_stats_snapshots'
+
+    channel_id: Mapped[str] = mapped_column(String(255), ForeignKey('channels_metadata.id_channel'), primary_key=True)
+    captured_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    view_count: Mapped[int] = mapped_column(BigInteger)
+    subscription_count: Mapped[int] = mapped_column(BigInteger)
+    video_count: Mapped[int] = mapped_column(BigInteger)
\ No newline at end of file
@@ -1,6 +1,6 @@
 import asyncio
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from threading import Thread
 from datetime import datetime
 from controllers.youtube_api_controller import YouTubeDataParser
@@ -25,6 +25,8 @@ class YouTubeAsyncApp:
 
         self.list_videos_id = None
 
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Create a dialog for API key input
         self.create_api_key_dialog()
 
@@ -130,8 +132,12 @@ class YouTubeAsyncApp:
         self.category_entry.grid(row=2, column=1, padx=5, pady=2, sticky=tk.W)
         self.category_entry.insert(0, "1")
 
+        ttk.Label(search_frame, text="Channel ID | @handle | URL:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.channel_entry = ttk.Entry(search_frame, width=40)
+        self.channel_entry.grid(row=3, column=1, padx=5, pady=2, sticky=tk.W)
+
         # Separator
-        ttk.Separator(search_frame, orient=tk.VERTICAL).grid(row=0, column=2, rowspan=3, sticky='ns', padx=10)
+        ttk.Separator(search_frame, orient=tk.VERTICAL).grid(row=0, column=2, rowspan=4, sticky='ns', padx=10)
 
         # Right side - specific video parameters
         ttk.Label(search_frame, text="Video ID | URL:").grid(row=0, column=3, sticky=tk.W, padx=10, pady=2)
@@ -203,6 +209,35 @@ class YouTubeAsyncApp:
         ttk.Button(control_frame, text='Process Video by ID | URL', 
                  command=lambda: self.run_async(self.process_video_by_id())).pack(side=tk.LEFT, padx=5)
 
+        ttk.Button(control_frame, text='Load Channel Uploads', 
+                 command=lambda: self.run_async(self.load_channel_uploads())).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text='Import IDs from File', 
+                 command=self.import_video_ids).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text='Poll Statistics', 
+                 command=lambda: self.run_async(self.poll_statistics())).pack(side=tk.LEFT, padx=5)
+
+        self.auto_poll_button = ttk.Button(control_frame, text='Start Auto Polling', 
+                 command=lambda: self.run_async(self.toggle_auto_polling()))
+        self.auto_poll_button.pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(control_frame, text='Enrich Commenters', 
+                 command=lambda: self.run_async(self.enrich_commenters())).pack(side=tk.LEFT, padx=5)
+
+        # Running crawl control
+        crawl_frame = ttk.LabelFrame(self.root, text="Processing Control", padding=10)
+        crawl_frame.pack(fill=tk.X, padx=10, pady=5, anchor='nw')
+
+        ttk.Button(crawl_frame, text='Pause', 
+                 command=lambda: self.run_async(self.pause_processing())).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(crawl_frame, text='Resume', 
+                 command=lambda: self.run_async(self.resume_processing())).pack(side=tk.LEFT, padx=5)
+
+        ttk.Button(crawl_frame, text='Cancel', 
+                 command=lambda: self.run_async(self.cancel_processing())).pack(side=tk.LEFT, padx=5)
+
         # Operation log
         self.log_frame = ttk.LabelFrame(self.root, text="Operation Log", padding=10)
         self.log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10, anchor='nw')
@@ -249,36 +284,120 @@ class YouTubeAsyncApp:
             self.log_message(f"Error during video search: {str(e)}")
             raise
 
+    async def load_channel_uploads(self):
+        """Asynchronous loading of channel uploads into the video list"""
+        try:
+            channel = self.channel_entry.get().strip()
+            self.log_message(f"Loading uploads of channel: {channel}")
+            self.list_videos_id = await self.con.channel_videos(channel)
+            self.log_message(f"Videos found: {len(self.list_videos_id)}")
+        except Exception as e:
+            self.log_message(f"Error loading channel uploads: {str(e)}")
+            raise
+
+    def import_video_ids(self):
+        """Choose a file with video URLs | IDs and load them into the video list"""
+        path = filedialog.askopenfilename(
+            title="Select file with video URLs | IDs",
+            filetypes=[("Text files", "*.txt *.csv"), ("All files", "*.*")]
+        )
+        if path:
+            self.run_async(self.import_videos(path))
+
+    async def import_videos(self, path):
+        """Asynchronous import of video IDs from a file"""
+        try:
+            self.log_message(f"Importing video IDs from: {path}")
+            self.list_videos_id, skipped = await self.con.import_videos(path)
+            self.log_message(f"Videos found: {len(self.list_videos_id)}")
+            if skipped:
+                self.log_message(f"Skipped {skipped} lines without a video ID | URL")
+        except Exception as e:
+            self.log_message(f"Error importing video IDs: {str(e)}")
+            raise
+
+    async def poll_statistics(self):
+        """Asynchronous re-polling of video statistics that are due"""
+        self.log_message("Polling statistics of tracked videos...")
+        saved = await self.con.poll_statistics()
+        self.log_message(f"Statistics snapshots saved: {saved}")
+
+    async def toggle_auto_polling(self):
+        """Start or stop periodic re-polling of video statistics"""
+        if self.con.stop_auto_polling():
+            self.auto_poll_button.config(text='Start Auto Polling')
+            self.log_message("Auto polling of statistics stopped")
+            return
+
+        self.con.start_auto_polling(
+            on_pass=lambda saved: self.log_message(f"Statistics snapshots saved: {saved}")
+        )
+        self.auto_poll_button.config(text='Stop Auto Polling')
+        self.log_message("Auto polling of statistics started")
+
+    def on_close(self):
+        """Stop background polling and close the application"""
+        if self.con:
+            self.loop.call_soon_threadsafe(self.con.stop_auto_polling)
+        self.root.destroy()
+
+    async def enrich_commenters(self):
+        """Asynchronous loading of commenter channels that are not stored yet"""
+        self.log_message("Loading channels of the most active commenters...")
+        stored = await self.con.enrich_commenters()
+        self.log_message(f"Commenter channels stored: {stored}")
+
     async def process_all_videos(self):
         """Asynchronous video processing with immediate ID logging after processing"""
         if not self.list_videos_id:
             self.log_message("No video list to process. Perform search first.")
             return 0
+        if self.con.crawling:
+            self.log_message("Processing is already running. Cancel it or wait for it to finish.")
+            return 0
 
         self.log_message("Starting processing of all videos...")
-        
-        async def process_and_log(video_id):
-            try:
-                self.log_message(f"Currently processing video with ID: {video_id}")
-                result = await self.con.create_data_video(video_id=video_id)
-                outcome_message = (
-                    f"Video {video_id} processed successfully"
-                    if result
-                    else f"Error processing video {video_id}"
-                )
-                self.log_message(outcome_message)
-                return result
-            except Exception as e:
-                self.log_message(f"Error processing video {video_id}: {str(e)}")
-                return False
-
-        tasks = [process_and_log(video_id) for video_id in self.list_videos_id]
-        results = await asyncio.gather(*tasks)
 
-        success_count = sum(1 for r in results if r)
-        self.log_message(f"Final result: processed {success_count} out of {len(self.list_videos_id)} videos")
+        video_ids = await self.con.filter_known(self.list_videos_id)
+        skipped = len(self.list_videos_id) - len(video_ids)
+        if skipped:
+            self.log_message(f"Skipped {skipped} videos already stored with all comments")
+
+        # Results arrive as soon as each video is written
+        success_count = 0
+        async for video_id, result in self.con.stream_videos(video_ids):
+            if result:
+                success_count += 1
+                self.log_message(f"Video {video_id} processed successfully")
+            else:
+                self.log_message(f"Error processing video {video_id}")
+
+        if self.con.cancelled:
+            self.log_message("Processing cancelled")
+        self.log_message(f"Final result: processed {success_count} out of {len(video_ids)} videos")
         
         return success_count
+
+    async def pause_processing(self):
+        """Pause the running processing after the videos in flight"""
+        if self.con.pause():
+            self.log_message("Processing paused")
+        else:
+            self.log_message("No processing is running")
+
+    async def resume_processing(self):
+        """Resume the paused processing"""
+        if self.con.resume():
+            self.log_message("Processing resumed")
+        else:
+            self.log_message("No processing is running")
+
+    async def cancel_processing(self):
+        """Cancel the running processing; already fetched videos are still saved"""
+        if self.con.cancel():
+            self.log_message("Cancelling processing...")
+        else:
+            self.log_message("No processing is running")
     
     async def process_video_by_id(self):
         """Asynchronous processing of a specific video by ID"""